@@ -1,12 +1,76 @@
 """
 This module implements access to the `Neo4j HTTP API <https://neo4j.com/docs/http-api/3.5/>`_ using the requests
-library.
+library. If `orjson <https://github.com/ijl/orjson>`_ is installed it is used to encode the requests and decode the
+responses, otherwise the standard library's json module is used.
 """
 
+import base64
+import gzip
+import queue
+import re
 import requests
 import sys
-from typing import List, Tuple
-from collections import namedtuple
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from requests.auth import AuthBase
+from typing import Iterable, List, Tuple
+from collections import deque, namedtuple
+from collections.abc import Mapping
+from functools import lru_cache
+from itertools import islice, takewhile, zip_longest
+from operator import itemgetter
+
+try:
+    # orjson is an optional, faster drop-in for encoding the statements and decoding the responses
+    import orjson
+
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    import json
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+    _loads = json.loads
+
+try:
+    # ijson is an optional dependency to parse the responses incrementally in Connector.stream
+    import ijson
+except ImportError:
+    ijson = None
+
+_row = itemgetter('row')
+_code_and_message = itemgetter('code', 'message')
+
+
+@lru_cache(maxsize=256)
+def _row_class(columns: tuple):
+    # statements with the same RETURN clause share their namedtuple row class, instead of creating one per result
+    return namedtuple('Row', columns, rename=True)
+
+
+@lru_cache(maxsize=256)
+def _column_index(columns: tuple) -> dict:
+    # the position of each column in the rows, shared by all RowViews of results with the same columns
+    return {column: idx for idx, column in enumerate(columns)}
+
+
+# Neo4j ends a response with an empty errors list when all statements succeeded
+_no_errors_suffix = b'"errors":[]}'
+
+
+def _has_no_errors(content: bytes) -> bool:
+    return content[-32:].rstrip().endswith(_no_errors_suffix)
+
+
+# matches the parameter placeholders of a Cypher statement in the old ({key}) and new ($key) syntax
+_parameter_placeholder = re.compile(r'\{(\w+)\}|\$(\w+)')
+# the variable that make_unwound_cypher binds the unwound rows to, which mustn't be used by the statement itself. Labels
+# (:row) and properties (n.row) aren't the variable, nor are the string literals and map keys that are removed first
+_row_variable = re.compile(r'(?<![\w.$:])row(?!\w)')
+_string_literal_or_map_key = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"|(?<=[{,])\s*\w+\s*:")
 
 
 class Statement(dict):
@@ -35,22 +99,305 @@ class Statement(dict):
     >>> print("Parameters dict: {}".format(str(statement['parameters']))
     """
 
+    __slots__ = ('_encoded_cypher',)
+
     def __init__(self, cypher: str, parameters: dict = None):
         super().__init__(statement=cypher)
         if parameters:
             self['parameters'] = parameters
+        self._encoded_cypher = None
+
+    def __reduce__(self):
+        # copies and pickles only contain the dictionary, not the encoding shared with a template
+        return self.__class__, (self.get('statement'),), None, None, iter(self.items())
+
+    def with_params(self, parameters: dict = None) -> 'Statement':
+        """
+        Method that creates a new :class:`Statement` with the same Cypher statement and the provided parameters. The
+        JSON encoding of the Cypher statement is shared by all statements created this way, so for many statements
+        from the same template only the parameters are encoded per statement.
+
+        Args:
+            parameters (dict): [optional] parameters that are merged into the statement at the server-side
+
+        Returns:
+            Statement: the new statement
+
+        Example code:
+
+        >>> template = Statement("MATCH (n:node {uuid: {uuid}}) RETURN n")
+        >>> statements = [template.with_params({'uuid': uuid}) for uuid in ['123abc', '456def']]
+        """
+        cypher = self['statement']
+        if self._encoded_cypher is None or self._encoded_cypher[0] is not cypher:
+            # the encoded statement without its closing brace, to which the encoded parameters are appended
+            self._encoded_cypher = (cypher, _dumps({'statement': cypher})[:-1])
+
+        statement = Statement(cypher, parameters)
+        statement._encoded_cypher = self._encoded_cypher
+        return statement
+
+    def to_json_bytes(self) -> bytes:
+        """
+        Method that returns the JSON encoded statement.
+
+        Returns:
+            bytes: the JSON encoded statement
+        """
+        # the shared encoding of the template is only valid as long as the statement wasn't replaced or extended
+        if (self._encoded_cypher is None or self._encoded_cypher[0] is not self.get('statement')
+                or not self.keys() <= {'statement', 'parameters'}):
+            return _dumps(self)
+
+        encoded_cypher = self._encoded_cypher[1]
+        if 'parameters' in self:
+            return encoded_cypher + b',"parameters":' + _dumps(self['parameters']) + b'}'
+        return encoded_cypher + b'}'
+
+
+class _EncodedBatch(list):
+    # batch of statements that also holds their encodings, so that measuring a batch doesn't encode it twice
+
+    def __init__(self):
+        super().__init__()
+        self.encoded = []
+
+
+def _encode_statement(statement: Statement) -> bytes:
+    return statement.to_json_bytes() if isinstance(statement, Statement) else _dumps(statement)
+
+
+def _encode_statements(statements: List[Statement]) -> bytes:
+    # join the encoded statements (re-using the encodings of an _EncodedBatch) instead of encoding a new payload dict
+    encoded = getattr(statements, 'encoded', None)
+    if encoded is None:
+        encoded = map(_encode_statement, statements)
+    return b'{"statements":[' + b','.join(encoded) + b']}'
+
+
+class _BasicAuth(AuthBase):
+    # basic authentication with a header that is computed once, instead of for every request (like HTTPBasicAuth)
+
+    def __init__(self, credentials: Tuple[str, str]):
+        username, password = credentials
+        self.header = 'Basic ' + base64.b64encode('{}:{}'.format(username, password).encode('utf-8')).decode('ascii')
+
+    def __call__(self, request):
+        request.headers['Authorization'] = self.header
+        return request
+
+
+def _table_to_rows(param_table) -> List[dict]:
+    # a pyarrow Table converts itself to rows in C
+    if hasattr(param_table, 'to_pylist'):
+        return param_table.to_pylist()
+
+    # numpy arrays (and similar) are converted to lists of native Python values that can be encoded as JSON
+    keys = list(param_table)
+    columns = [
+        values.tolist() if hasattr(values, 'tolist') else list(values)
+        for values in param_table.values()
+    ]
+    if len({len(values) for values in columns}) > 1:
+        raise ValueError("all columns of the param_table should have the same length")
+    return [dict(zip(keys, row)) for row in zip(*columns)]
+
+
+# marks the end of the items of a pipeline stage
+_pipeline_end = object()
+
+
+def _pipeline_stage(items, function, output: queue.Queue, errors: list):
+    # applies the function to the items and puts the results in the output queue. After an error in any stage the
+    # remaining items are skipped, but still consumed so the previous stage doesn't block on a full queue
+    try:
+        for item in items:
+            if not errors:
+                output.put(function(item))
+    except BaseException as error:
+        errors.append(error)
+        for _ in items:
+            pass
+    finally:
+        output.put(_pipeline_end)
+
+
+class _BaseConnector:
+    # configuration, batching, encoding and decoding shared by the Connector and the neo4j.aio.AsyncConnector, which
+    # only differ in how the requests are sent to Neo4j
+
+    # default endpoint of localhost
+    default_host = 'http://localhost:7474'
+    default_path = '/db/data/transaction/commit'
+
+    # default credentials
+    default_credentials = ('neo4j', 'neo4j')
+
+    # maximum number of pooled connections, which also caps the number of concurrently POST-ed batches
+    pool_maxsize = 32
+
+    # supported representations of the rows of a result
+    row_factories = (None, 'namedtuple', 'columnar', 'view')
+
+    def __init__(self, host: str, credentials: Tuple[str, str], verbose_errors: bool, compress: bool,
+                 min_compress_bytes: int):
+        self.endpoint = host + self.default_path
+        self.credentials = credentials
+        self.verbose_errors = verbose_errors
+        self.compress = compress
+        self.min_compress_bytes = min_compress_bytes
+
+    @staticmethod
+    def make_batches(statements: Iterable[Statement], batch_size: int = None, byte_budget: int = None) -> List:
+        if batch_size is not None and batch_size < 1:
+            raise ValueError("batchsize should be >= 1")
+        if byte_budget is not None and byte_budget < 1:
+            raise ValueError("byte_budget should be >= 1")
+
+        # batches limited by the size of the encoded statements and optionally the number of statements
+        if byte_budget is not None:
+            batch = _EncodedBatch()
+            batch_bytes = 0
+            for statement in statements:
+                # the encoding is kept with the batch, so it is re-used when the batch is POST-ed
+                encoded = _encode_statement(statement)
+                statement_bytes = len(encoded) + 1  # including the separating comma
+                if batch and (batch_bytes + statement_bytes > byte_budget or len(batch) == batch_size):
+                    yield batch
+                    batch = _EncodedBatch()
+                    batch_bytes = 0
+                batch.append(statement)
+                batch.encoded.append(encoded)
+                batch_bytes += statement_bytes
+            if batch:
+                yield batch
+
+        # only 1 batch
+        elif batch_size is None:
+            yield statements
+
+        # multiple batches, taken from an iterator so that the statements can also be produced by a generator
+        else:
+            statements_iter = iter(statements)
+            while True:
+                batch = list(islice(statements_iter, batch_size))
+                if not batch:
+                    break
+                yield batch
+
+    @staticmethod
+    def make_unwound_cypher(cypher: str) -> str:
+        """
+        Method that rewrites a parametrized Cypher statement into a statement that unwinds the :code:`batch` parameter
+        and reads the parameters from its rows instead.
+
+        Args:
+            cypher (str): the parametrized Cypher statement
+
+        Returns:
+            str: the unwound Cypher statement
+
+        Raises:
+            ValueError: if the Cypher statement already uses the variable :code:`row`
+
+        Example code:
+
+        >>> Connector.make_unwound_cypher("MATCH (n:node {uuid: {uuid}}) RETURN n")
+        'UNWIND $batch AS row MATCH (n:node {uuid: row.uuid}) RETURN n'
+        """
+        if _row_variable.search(_parameter_placeholder.sub('', _string_literal_or_map_key.sub('', cypher))):
+            raise ValueError("the Cypher statement can't be unwound, because it already uses the variable 'row'")
+
+        return 'UNWIND $batch AS row ' + _parameter_placeholder.sub(
+            lambda match: 'row.' + (match.group(1) or match.group(2)), cypher)
+
+    def _encode(self, statements: List[Statement]) -> Tuple[bytes, dict]:
+        data = _encode_statements(statements)
+        headers = None
+        if self.compress and len(data) >= self.min_compress_bytes:
+            # the lowest compression level is fast and still compresses the repetitive JSON very well
+            data = gzip.compress(data, compresslevel=1)
+            headers = {'Content-Encoding': 'gzip'}
+        return data, headers
+
+    def _decode(self, content: bytes) -> dict:
+        json_response = _loads(content)
+        self._check_for_errors(json_response)
+        return json_response
+
+    def _check_for_errors(self, json_response):
+        errors = json_response.get('errors')
+        if errors:
+            neo4j_errors = Neo4jErrors(errors)
+            if self.verbose_errors:
+                for neo4j_error in neo4j_errors:
+                    print(neo4j_error.code, file=sys.stderr)
+                    print(neo4j_error.message, file=sys.stderr)
+            raise neo4j_errors
+
+    @classmethod
+    def _check_row_factory(cls, row_factory):
+        if row_factory not in cls.row_factories:
+            raise ValueError("row_factory should be one of {}".format(cls.row_factories))
+
+    @staticmethod
+    def _clean_results(response, row_factory: str = None):
+        cleaned_results = []
+        for result in response['results']:
+            # the columns are shared by all rows of a result, so look them up only once
+            columns = result['columns']
+            rows = map(_row, result['data'])
+
+            if row_factory == 'namedtuple':
+                row_class = _row_class(tuple(columns))
+                cleaned_results.append([row_class._make(row) for row in rows])
+            elif row_factory == 'view':
+                column_index = _column_index(tuple(columns))
+                cleaned_results.append([RowView(column_index, row) for row in rows])
+            elif row_factory == 'columnar':
+                # transpose the rows, a result without rows still gets an (empty) list per column
+                cleaned_results.append({
+                    column: list(values)
+                    for column, values in zip_longest(columns, zip(*rows), fillvalue=())
+                })
+            else:
+                cleaned_results.append([dict(zip(columns, row)) for row in rows])
+        return cleaned_results
+
+    def _unwound_statements(self, cypher: str, rows: List[dict], batch_size: int) -> List[Statement]:
+        # a single statement per batch of rows, that unwinds the rows of its batch
+        unwound_cypher = self.make_unwound_cypher(cypher)
+        return [Statement(unwound_cypher, {'batch': batch}) for batch in self.make_batches(rows, batch_size)]
+
+    def _flatten_results(self, responses, row_factory: str = None) -> List[List[dict]]:
+        # flatten cleaned responses from batches
+        return [
+            row
+            for response in responses
+            for row in self._clean_results(response, row_factory)
+        ]
 
 
-class Connector:
+class Connector(_BaseConnector):
     """Class that abstracts communication with neo4j into up-front setup and then executes one or more
-    :class:`Statement`. The connector doesn't maintain an open connection and thus doesn't need to be closed after
-    use.
+    :class:`Statement`. The connector keeps a pool of keep-alive HTTP connections so consecutive requests (e.g. the
+    batches of :meth:`run_multiple`) don't pay for a new TCP/TLS handshake each time. Call :meth:`close` or use the
+    connector as a context manager to release the pooled connections.
 
     Args:
         endpoint (str): the fully qualified endpoint to send messages to
-        credentials (tuple[str, str]): the credentials that are used to authenticate the requests
+        credentials (tuple[str, str]): the credentials that are used to authenticate the requests, None for a server
+            without authentication
         verbose_errors (bool): if set to True the :class:`Connector` prints :class:`Neo4jErrors` messages and codes to
             the standard error output in a bit nicer format than the stack trace.
+        session (requests.Session): [optional] a pre-configured session to send the requests with, e.g. one with
+            custom adapters, proxies or certificates. The credentials and JSON headers are set on it by the
+            :class:`Connector`. By default a session with a pool of :attr:`pool_maxsize` connections is created.
+        compress (bool): [optional] if set to True request bodies of at least min_compress_bytes are gzip compressed.
+            Large batches of parametrized statements compress very well, which cuts the upload time on slow networks.
+            Only enable this if Neo4j (or the proxy in front of it) accepts gzip encoded request bodies.
+        min_compress_bytes (int): [optional] minimum size of a request body to compress it, smaller bodies aren't
+            worth the CPU time
 
     Example code:
 
@@ -62,22 +409,51 @@ class Connector:
 
     >>> # custom connector
     >>> connector = Connector('http://mydomain:7474', ('username', 'password'))
+
+    >>> # connector that sends its requests through a custom session
+    >>> connector = Connector(session=my_session)
+
+    >>> # connector that compresses large requests
+    >>> connector = Connector('http://mydomain:7474', ('username', 'password'), compress=True)
+
+    >>> # release the pooled connections when done
+    >>> with Connector() as connector:
+    >>>     connector.run("MATCH () RETURN COUNT(*) AS node_count")
     """
 
-    # default endpoint of localhost
-    default_host = 'http://localhost:7474'
-    default_path = '/db/data/transaction/commit'
+    # connection pool sizing of the underlying HTTP session
+    pool_connections = 4
 
-    # default credentials
-    default_credentials = ('neo4j', 'neo4j')
+    def __init__(self, host: str = _BaseConnector.default_host,
+                 credentials: Tuple[str, str] = _BaseConnector.default_credentials, verbose_errors=False,
+                 session: requests.Session = None, compress: bool = False, min_compress_bytes: int = 4096):
+        super().__init__(host, credentials, verbose_errors, compress, min_compress_bytes)
 
-    def __init__(self, host: str = default_host, credentials: Tuple[str, str] = default_credentials,
-                 verbose_errors=False):
-        self.endpoint = host + self.default_path
-        self.credentials = credentials
-        self.verbose_errors = verbose_errors
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+
+        self._session = session
+        if credentials is not None:
+            self._session.auth = _BasicAuth(credentials)
+        self._session.headers.update({'Content-Type': 'application/json', 'Accept': 'application/json'})
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
-    def run(self, cypher: str, parameters: dict = None):
+    def close(self):
+        """
+        Method that closes the pooled HTTP connections. The connector can still be used afterwards, but new connections
+        will have to be set up again.
+        """
+        self._session.close()
+
+    def run(self, cypher: str, parameters: dict = None, row_factory: str = None):
         """
         Method that runs a single statement against Neo4j in a single transaction. This method builds the
         :class:`Statement` object for the user.
@@ -86,10 +462,17 @@ class Connector:
             cypher (str): the Cypher statement
             parameters (dict): [optional] parameters that are merged into the statement at the server-side. Parameters
                 help with speeding up queries because the execution plan for identical Cypher statements is cached.
+            row_factory (str): [optional] how the rows of a result are represented. By default (i.e. None) every row
+                is a dictionary. With 'namedtuple' every row is a namedtuple that shares its class with the other rows
+                of the result, which costs a lot less memory than a dictionary per row (invalid field names, e.g.
+                'COUNT(*)', are replaced by positional names). With 'columnar' a result is a single dictionary that maps
+                each column to the list of its values, which is convenient for loading into e.g. pandas or numpy.
+                With 'view' every row is a read-only :class:`RowView` mapping on top of the parsed response, which
+                avoids building a dictionary per row when only a few fields are read.
 
         Returns:
             list[dict]: a list of dictionaries, one dictionary for each row in the result. The keys in the dictionary
-            are defined in the Cypher statement
+            are defined in the Cypher statement. The shape of the rows depends on the row_factory
 
         Raises:
             Neo4jErrors
@@ -105,24 +488,56 @@ class Connector:
         >>> # get a single node's properties with a statement + parameter
         >>> # in this case we're assuming: CONSTRAINT ON (node:node) ASSERT node.uuid IS UNIQUE
         >>> single_node_properties_by_uuid = connector.run("MATCH (n:node {uuid: {uuid}}) RETURN n", {'uuid': '123abc'})[0]['n']
+
+        >>> # memory efficient rows
+        >>> all_node_ids = [row.node_id for row in connector.run("MATCH (n) RETURN id(n) AS node_id", row_factory='namedtuple')]
+
+        >>> # columnar result
+        >>> all_node_ids = connector.run("MATCH (n) RETURN id(n) AS node_id", row_factory='columnar')['node_id']
         """
+        self._check_row_factory(row_factory)
         response = self.post([Statement(cypher, parameters)])
-        return self._clean_results(response)[0]
+        return self._clean_results(response, row_factory)[0]
 
-    def run_multiple(self, statements: List[Statement], batch_size: int = None) -> List[List[dict]]:
+    def run_multiple(self, statements: Iterable[Statement], batch_size: int = None,
+                     max_in_flight: int = 1, row_factory: str = None, byte_budget: int = None,
+                     pipelined: bool = False) -> List[List[dict]]:
         """
         Method that runs multiple :class:`Statement`\ s against Neo4j in a single transaction or several batches.
+        Note that every batch is committed in its own transaction, so statements in different batches are not part of
+        the same transaction.
 
         Args:
-            statements (list[Statement]): the statements to execute
+            statements (iterable[Statement]): the statements to execute. With a batch_size or byte_budget this can also
+                be a generator, so the statements don't all have to be in memory at the same time
             batch_size (int): [optional] number of statements to send to Neo4j per batch. In case the batch_size is
                 omitted (i.e. None) then all statements are sent as a single batch. This parameter can help make large
                 jobs manageable for Neo4j (e.g not running out of memory).
+            max_in_flight (int): [optional] maximum number of batches that are POST-ed to Neo4j concurrently. By default
+                the batches are sent one after the other. Values larger than 1 overlap the network latency of the
+                batches, but are capped by :attr:`pool_maxsize` pooled connections. Only max_in_flight batches are
+                read from the statements ahead of the responses that are being processed.
+            row_factory (str): [optional] how the rows of a result are represented. By default (i.e. None) every row
+                is a dictionary. With 'namedtuple' every row is a namedtuple that shares its class with the other rows
+                of the result, which costs a lot less memory than a dictionary per row (invalid field names, e.g.
+                'COUNT(*)', are replaced by positional names). With 'columnar' a result is a single dictionary that maps
+                each column to the list of its values, which is convenient for loading into e.g. pandas or numpy.
+                With 'view' every row is a read-only :class:`RowView` mapping on top of the parsed response, which
+                avoids building a dictionary per row when only a few fields are read.
+            byte_budget (int): [optional] maximum size in bytes of the encoded statements per batch, e.g. 8 * 1024 *
+                1024. Together with batch_size this keeps batches of "fat" statements from overwhelming Neo4j while
+                batches of small statements can still grow up to batch_size. A single statement larger than the budget
+                is sent as a batch of its own.
+            pipelined (bool): [optional] if set to True the batches are encoded, sent and decoded in separate threads,
+                so the encoding and decoding of batches overlaps with waiting for Neo4j. This can't be combined with
+                max_in_flight. Note that a few batches after a failing batch may already have been sent (and committed)
+                before the error is raised.
 
         Returns:
             list[list[dict]]: a list of statement results, each containing a list of dictionaries, one dictionary for
             each row in the result. The keys in the dictionary are defined in the Cypher statement. The statement
-            results have the same order as the corresponding :class:`Statement`\ s
+            results have the same order as the corresponding :class:`Statement`\ s. The shape of the rows depends on
+            the row_factory
 
         Raises:
             Neo4jErrors
@@ -145,6 +560,15 @@ class Connector:
         >>>     for row in statement_responses:
         >>>         print(row)
 
+        >>> # or the encoding and decoding of the batches can overlap with waiting for Neo4j's responses
+        >>> statements_responses = connector.run_multiple(statements, batch_size=10_000, pipelined=True)
+
+        >>> # batches can also be limited by the size of the encoded statements
+        >>> statements_responses = connector.run_multiple(statements, batch_size=10_000, byte_budget=8 * 1024 * 1024)
+
+        >>> # independent batches can be sent concurrently to hide the network latency of each request
+        >>> statements_responses = connector.run_multiple(statements, batch_size=10_000, max_in_flight=4)
+
         >>> # we can easily re-use some information from the statement in the next example
         >>> cypher = "MATCH (language {name: {name}})-->(word:word)) RETURN word"
         >>> statements = [Statement(cypher, {'name': lang}) for lang in ['en', 'nl']
@@ -153,14 +577,157 @@ class Connector:
         >>>     for row in responses:
         >>>         print("{language}: {word_lemma}".format(language=statement['parameters']['lang'], word=row['word']['lemma']))
         """
-        # flatten cleaned responses from batches
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight should be >= 1")
+        if pipelined and max_in_flight > 1:
+            raise ValueError("pipelined can't be combined with max_in_flight > 1")
+        self._check_row_factory(row_factory)
+
+        batches = self.make_batches(statements, batch_size, byte_budget)
+        if pipelined:
+            responses = self._post_pipelined(batches)
+        elif max_in_flight == 1:
+            responses = map(self.post, batches)
+        else:
+            responses = self._post_concurrently(batches, min(max_in_flight, self.pool_maxsize))
+
+        return self._flatten_results(responses, row_factory)
+
+    def execute(self, statements: Iterable[Statement], batch_size: int = None, byte_budget: int = None):
+        """
+        Method that runs multiple :class:`Statement` objects against Neo4j for their side effects only, e.g. when
+        importing data. It takes the same batching parameters as :meth:`run_multiple`, but the results are discarded:
+        a response is only parsed when it contains errors, which saves decoding the whole response for large write
+        jobs.
+
+        Args:
+            statements (iterable[Statement]): the statements to execute. With a batch_size or byte_budget this can also
+                be a generator
+            batch_size (int): [optional] number of statements to send to Neo4j per batch. In case the batch_size is
+                omitted (i.e. None) then all statements are sent as a single batch
+            byte_budget (int): [optional] maximum size in bytes of the encoded statements per batch
+
+        Raises:
+            Neo4jErrors
+
+        Example code:
+
+        >>> cypher = "CREATE (n:node {uuid: {uuid}})"
+        >>> connector.execute([Statement(cypher, {'uuid': uuid}) for uuid in range(1_000_000)], batch_size=10_000)
+        """
+        for statements_batch in self.make_batches(statements, batch_size, byte_budget):
+            content = self._send(*self._encode(statements_batch)).content
+            if not _has_no_errors(content):
+                self._decode(content)
+
+    def run_unwound(self, cypher: str, rows: List[dict], batch_size: int = 10000,
+                    max_in_flight: int = 1) -> List[dict]:
+        """
+        Method that runs the same parametrized Cypher statement for many parameter dictionaries by rewriting it into a
+        single :code:`UNWIND $batch AS row ...` statement per batch. Instead of e.g. 10 000 :class:`Statement` objects
+        Neo4j receives 1 statement with a list parameter of 10 000 elements, which is planned once and is a lot cheaper
+        to transfer and execute. Every batch is committed in its own transaction.
+
+        Note that the unwound statement runs once for all rows of a batch instead of once per row, so it only returns
+        the same rows as separate statements if the statement works on each row independently. Aggregations (e.g.
+        :code:`COUNT`), :code:`ORDER BY`, :code:`SKIP`, :code:`LIMIT` and :code:`DISTINCT` apply to all rows of a
+        batch together, so e.g. :code:`LIMIT 1` returns 1 row per batch instead of 1 row per parameter dictionary.
+
+        Args:
+            cypher (str): the parametrized Cypher statement. The placeholders ({key} or $key) are replaced by the
+                corresponding field of the unwound row (row.key), including placeholders that appear in string literals
+            rows (list[dict]): the parameters, one dictionary per execution of the statement
+            batch_size (int): [optional] number of rows to send to Neo4j per batch
+            max_in_flight (int): [optional] maximum number of batches that are POST-ed to Neo4j concurrently
+
+        Returns:
+            list[dict]: a list of dictionaries, one dictionary for each row in the results of all batches. The keys in
+            the dictionary are defined in the Cypher statement
+
+        Raises:
+            Neo4jErrors
+            ValueError: if the Cypher statement already uses the variable :code:`row`
+
+        Example code:
+
+        >>> # returns the same nodes as a Statement(cypher, {'uuid': uuid}) for every uuid, but in a single statement
+        >>> cypher = "MATCH (n:node {uuid: {uuid}}) RETURN n"
+        >>> nodes = [row['n'] for row in connector.run_unwound(cypher, [{'uuid': uuid} for uuid in ['123abc', '456def']])]
+        """
+        unwound_statements = self._unwound_statements(cypher, rows, batch_size)
         return [
             row
-            for statements_batch in self.make_batches(statements, batch_size)
-            for row in self._clean_results(self.post(statements_batch))
+            for batch_rows in self.run_multiple(unwound_statements, batch_size=1, max_in_flight=max_in_flight)
+            for row in batch_rows
         ]
 
-    def post(self, statements: List[Statement]):
+    def run_batch(self, cypher: str, param_table, batch_size: int = 10000, max_in_flight: int = 1) -> List[dict]:
+        """
+        Method that works like :meth:`run_unwound`, but takes the parameters as columns instead of rows, e.g. a
+        dictionary of lists or numpy arrays or a pyarrow Table. This saves callers that already have their data in
+        a columnar format from building a dictionary per row themselves.
+
+        Args:
+            cypher (str): the parametrized Cypher statement. The placeholders ({key} or $key) are replaced by the
+                corresponding field of the unwound row (row.key)
+            param_table (dict[str, list] | pyarrow.Table): the parameters, one column per parameter key. All columns
+                should have the same length
+            batch_size (int): [optional] number of rows to send to Neo4j per batch
+            max_in_flight (int): [optional] maximum number of batches that are POST-ed to Neo4j concurrently
+
+        Returns:
+            list[dict]: a list of dictionaries, one dictionary for each row in the results of all batches. The keys in
+            the dictionary are defined in the Cypher statement
+
+        Raises:
+            Neo4jErrors
+            ValueError: if the columns of the param_table have different lengths
+
+        Example code:
+
+        >>> cypher = "MATCH (n:node {uuid: {uuid}}) SET n.score = {score}"
+        >>> connector.run_batch(cypher, {'uuid': ['123abc', '456def'], 'score': numpy.array([0.5, 0.7])})
+        """
+        return self.run_unwound(cypher, _table_to_rows(param_table), batch_size, max_in_flight)
+
+    def stream(self, cypher: str, parameters: dict = None):
+        """
+        Method that runs a single statement against Neo4j in a single transaction, just like :meth:`run`, but yields
+        the rows while the response is being parsed instead of returning them all at once. If `ijson
+        <https://github.com/ICRAR/ijson>`_ is installed only the rows of a single result are kept in memory, which caps
+        the peak memory for huge result sets. Without ijson the whole response is parsed first.
+
+        Args:
+            cypher (str): the Cypher statement
+            parameters (dict): [optional] parameters that are merged into the statement at the server-side. Parameters
+                help with speeding up queries because the execution plan for identical Cypher statements is cached.
+
+        Yields:
+            dict: one dictionary for each row in the result. The keys in the dictionary are defined in the Cypher
+            statement
+
+        Raises:
+            Neo4jErrors: Neo4j reports the errors at the end of the response, so they are raised after the rows that
+                were received before the error
+
+        Example code:
+
+        >>> for row in connector.stream("MATCH (n) RETURN n"):
+        >>>     print(row['n'])
+        """
+        if ijson is None:
+            yield from self.run(cypher, parameters)
+            return
+
+        raw = self.post([Statement(cypher, parameters)], stream=True)
+        try:
+            for _, rows in self._clean_results_stream(raw):
+                yield from rows
+        finally:
+            # returns the connection to the pool if the response was read completely, otherwise it is discarded
+            raw.close()
+
+    def post(self, statements: List[Statement], stream: bool = False):
         """
         Method that performs an HTTP POST with the provided :class:`Statement`\ s and returns the parsed data structure
         as `specified in Neo4j's documentation
@@ -170,6 +737,8 @@ class Connector:
 
         Args:
             statements (list[Statement]): the statements that are POST-ed to Neo4j
+            stream (bool): [optional] if set to True the raw, unparsed response stream is returned instead and checking
+                for errors is left to the caller
 
         Returns:
             dict: the parsed Neo4j HTTP API response
@@ -186,51 +755,124 @@ class Connector:
         >>>     for datum in result['data']:
         >>>         print(datum['row'][0]) #n is the first item in the row
         """
-        response = requests.post(self.endpoint, json={'statements': statements}, auth=self.credentials)
-        json_response = response.json()
+        response = self._send(*self._encode(statements), stream=stream)
+        if stream:
+            response.raw.decode_content = True
+            return response.raw
+
+        return self._decode(response.content)
+
+    def _send(self, data: bytes, headers: dict = None, stream: bool = False) -> requests.Response:
+        return self._session.post(self.endpoint, data=data, headers=headers, stream=stream)
+
+    def _post_concurrently(self, batches, max_in_flight: int):
+        # yields the responses in the order of the batches. Unlike executor.map, which reads all batches up front, at
+        # most max_in_flight batches are read from the (possibly lazy) batches before their responses are consumed.
+        with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+            in_flight = deque()
+            for batch in batches:
+                in_flight.append(executor.submit(self.post, batch))
+                if len(in_flight) == max_in_flight:
+                    yield in_flight.popleft().result()
+            while in_flight:
+                yield in_flight.popleft().result()
+
+    def _post_pipelined(self, batches) -> List[dict]:
+        # encodes, sends and decodes the batches in separate stages, so the CPU work of the encoding and decoding
+        # overlaps with waiting for Neo4j's responses. The queues between the stages hold at most 2 batches.
+        errors = []
+        encoded = queue.Queue(maxsize=2)
+        received = queue.Queue(maxsize=2)
+        stages = [
+            threading.Thread(target=_pipeline_stage, daemon=True,
+                             args=(takewhile(lambda _: not errors, batches), self._encode, encoded, errors)),
+            threading.Thread(target=_pipeline_stage, daemon=True,
+                             args=(iter(encoded.get, _pipeline_end), lambda item: self._send(*item).content, received,
+                                   errors)),
+        ]
+        for stage in stages:
+            stage.start()
+
+        # the decoding stage runs on the calling thread, it keeps draining the queue after an error so that the other
+        # stages can finish
+        responses = []
+        for content in iter(received.get, _pipeline_end):
+            if not errors:
+                try:
+                    responses.append(self._decode(content))
+                except BaseException as error:
+                    errors.append(error)
+
+        for stage in stages:
+            stage.join()
 
-        self._check_for_errors(json_response)
+        if errors:
+            raise errors[0]
+        return responses
+
+    def _clean_results_stream(self, raw):
+        # incrementally builds the results and errors from the parser events, so that only one result is in memory
+        errors = []
+        events = ijson.parse(raw, use_float=True)
+        for prefix, event, value in events:
+            if prefix not in ('results.item', 'errors.item') or event != 'start_map':
+                continue
+
+            builder = ijson.ObjectBuilder()
+            builder.event(event, value)
+            for item_prefix, item_event, item_value in events:
+                builder.event(item_event, item_value)
+                if item_prefix == prefix and item_event == 'end_map':
+                    break
+
+            if prefix == 'errors.item':
+                errors.append(builder.value)
+            else:
+                columns = builder.value['columns']
+                yield columns, [dict(zip(columns, row)) for row in map(_row, builder.value['data'])]
+
+        self._check_for_errors({'errors': errors})
+
+
+class RowView(Mapping):
+    """Read-only mapping of a row in the result of a statement, that indexes lazily into the parsed response instead of
+    copying the values into a new dictionary. All rows of a result share the mapping from the column names to the
+    positions in the row. :class:`RowView` objects are returned by :class:`Connector` methods with
+    :code:`row_factory='view'`.
 
-        return json_response
+    Args:
+        column_index (dict): the position of each column in the row
+        row (list): the values of the row as returned by Neo4j
 
-    @staticmethod
-    def make_batches(statements: List[Statement], batch_size: int = None) -> List:
-        # only 1 batch
-        if batch_size is None:
-            yield statements
+    Example code:
 
-        # multiple batches
-        else:
-            if batch_size < 1:
-                raise ValueError("batchsize should be >= 1")
+    >>> for row in connector.run("MATCH (n) RETURN n, id(n) AS node_id", row_factory='view'):
+    >>>     print(row['node_id'])
+    >>>     print(dict(row))
+    """
 
-            for start_idx in range(0, len(statements), batch_size):
-                yield statements[start_idx:start_idx + batch_size]
+    __slots__ = ('_column_index', '_row')
 
-    def _check_for_errors(self, json_response):
-        errors = json_response.get('errors')
-        if errors:
-            neo4j_errors = Neo4jErrors(errors)
-            if self.verbose_errors:
-                for neo4j_error in neo4j_errors:
-                    print(neo4j_error.code, file=sys.stderr)
-                    print(neo4j_error.message, file=sys.stderr)
-            raise neo4j_errors
+    def __init__(self, column_index: dict, row: list):
+        self._column_index = column_index
+        self._row = row
 
-    @staticmethod
-    def _clean_results(response):
-        return [
-            [
-                dict(zip(result['columns'], datum['row']))
-                for datum in result['data']
-            ]
-            for result in response['results']
-        ]
+    def __getitem__(self, column):
+        return self._row[self._column_index[column]]
+
+    def __iter__(self):
+        return iter(self._column_index)
+
+    def __len__(self):
+        return len(self._column_index)
+
+    def __repr__(self):
+        return '{}({!r})'.format(type(self).__name__, dict(self))
 
 
 class Neo4jErrors(Exception):
     """Exception that is raised when Neo4j responds to a request with one or more error message. Iterate over this
-    object to get the individual :class:`Neo4jError` objects
+    object to get the individual :class:`Neo4jError` objects, use :code:`len()` to get their number
 
     Args:
         errors (list(dict)): A list of dictionaries that contain the 'code' and 'message' properties
@@ -246,11 +888,14 @@ class Neo4jErrors(Exception):
     """
 
     def __init__(self, errors: List[dict]):
-        self.errors = [Neo4jError(error['code'], error['message']) for error in errors]
+        self.errors = list(map(Neo4jError._make, map(_code_and_message, errors)))
 
     def __iter__(self):
         return iter(self.errors)
 
+    def __len__(self):
+        return len(self.errors)
+
 
 # wrapped the namedtuple in a class so it gets documented properly
 class Neo4jError(namedtuple('Neo4jError', ['code', 'message'])):
@@ -0,0 +1,197 @@
+"""
+This module implements asynchronous access to the `Neo4j HTTP API <https://neo4j.com/docs/http-api/3.5/>`_ using the
+aiohttp library, which is an optional dependency (:code:`pip install neo4j-connector[aio]`). The synchronous
+:class:`neo4j.Connector` remains the default.
+"""
+
+import aiohttp
+import asyncio
+from typing import Iterable, List, Tuple
+
+from . import Statement, _BaseConnector, _BasicAuth, _has_no_errors, _table_to_rows
+
+
+class AsyncConnector(_BaseConnector):
+    """Class that abstracts communication with neo4j just like :class:`neo4j.Connector`, but its methods are
+    coroutines. This allows overlapping independent requests within a single event loop, so N independent reads take
+    about as long as a single one instead of N times as long. The connection pool is created on first use and is
+    released with :meth:`close` or by using the connector as an asynchronous context manager.
+
+    Args:
+        endpoint (str): the fully qualified endpoint to send messages to
+        credentials (tuple[str, str]): the credentials that are used to authenticate the requests, None for a server
+            without authentication
+        verbose_errors (bool): if set to True the :class:`AsyncConnector` prints :class:`neo4j.Neo4jErrors` messages
+            and codes to the standard error output in a bit nicer format than the stack trace.
+        compress (bool): [optional] if set to True request bodies of at least min_compress_bytes are gzip compressed.
+            Only enable this if Neo4j (or the proxy in front of it) accepts gzip encoded request bodies.
+        min_compress_bytes (int): [optional] minimum size of a request body to compress it
+        keepalive_timeout (float): [optional] number of seconds an idle pooled connection is kept open
+
+    Example code:
+
+    >>> async with AsyncConnector('http://mydomain:7474', ('username', 'password')) as connector:
+    >>>     node_counts = await asyncio.gather(*[
+    >>>         connector.run("MATCH (n:node {type: {type}}) RETURN COUNT(n) AS node_count", {'type': node_type})
+    >>>         for node_type in ['a', 'b', 'c']
+    >>>     ])
+    """
+
+    def __init__(self, host: str = _BaseConnector.default_host,
+                 credentials: Tuple[str, str] = _BaseConnector.default_credentials, verbose_errors=False,
+                 compress: bool = False, min_compress_bytes: int = 4096, keepalive_timeout: float = 30):
+        super().__init__(host, credentials, verbose_errors, compress, min_compress_bytes)
+        self.keepalive_timeout = keepalive_timeout
+
+        self._headers = {'Content-Type': 'application/json', 'Accept': 'application/json'}
+        if credentials is not None:
+            self._headers['Authorization'] = _BasicAuth(credentials).header
+        self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self):
+        """
+        Coroutine that closes the pooled HTTP connections. The connector can still be used afterwards, but a new pool
+        will be created.
+        """
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def run(self, cypher: str, parameters: dict = None, row_factory: str = None):
+        """
+        Coroutine version of :meth:`neo4j.Connector.run`.
+        """
+        self._check_row_factory(row_factory)
+        response = await self.post([Statement(cypher, parameters)])
+        return self._clean_results(response, row_factory)[0]
+
+    async def run_multiple(self, statements: Iterable[Statement], batch_size: int = None, max_in_flight: int = None,
+                           row_factory: str = None, byte_budget: int = None) -> List[List[dict]]:
+        """
+        Coroutine version of :meth:`neo4j.Connector.run_multiple`. The batches are POST-ed concurrently, at most
+        max_in_flight at a time (by default :attr:`pool_maxsize`). There is no pipelined mode, because the encoding and
+        decoding of a batch already overlaps with waiting for the responses of the other batches.
+        """
+        self._check_row_factory(row_factory)
+        responses = await self._gather_batches(self.post, statements, batch_size, byte_budget, max_in_flight)
+        return self._flatten_results(responses, row_factory)
+
+    async def execute(self, statements: Iterable[Statement], batch_size: int = None, byte_budget: int = None,
+                      max_in_flight: int = None):
+        """
+        Coroutine version of :meth:`neo4j.Connector.execute`. The batches are POST-ed concurrently, at most
+        max_in_flight at a time (by default :attr:`pool_maxsize`).
+        """
+        await self._gather_batches(self._execute_batch, statements, batch_size, byte_budget, max_in_flight)
+
+    async def run_unwound(self, cypher: str, rows: List[dict], batch_size: int = 10000,
+                          max_in_flight: int = None) -> List[dict]:
+        """
+        Coroutine version of :meth:`neo4j.Connector.run_unwound`. The batches are POST-ed concurrently, at most
+        max_in_flight at a time (by default :attr:`pool_maxsize`).
+        """
+        unwound_statements = self._unwound_statements(cypher, rows, batch_size)
+        return [
+            row
+            for batch_rows in await self.run_multiple(unwound_statements, batch_size=1, max_in_flight=max_in_flight)
+            for row in batch_rows
+        ]
+
+    async def run_batch(self, cypher: str, param_table, batch_size: int = 10000,
+                        max_in_flight: int = None) -> List[dict]:
+        """
+        Coroutine version of :meth:`neo4j.Connector.run_batch`. The batches are POST-ed concurrently, at most
+        max_in_flight at a time (by default :attr:`pool_maxsize`).
+        """
+        return await self.run_unwound(cypher, _table_to_rows(param_table), batch_size, max_in_flight)
+
+    def stream(self, cypher: str, parameters: dict = None) -> '_AsyncRows':
+        """
+        Asynchronous iterator version of :meth:`neo4j.Connector.stream`. The statement is run when the iteration
+        starts and the response is parsed as a whole before the rows are returned.
+
+        Example code:
+
+        >>> async for row in connector.stream("MATCH (n) RETURN n"):
+        >>>     print(row['n'])
+        """
+        return _AsyncRows(self, cypher, parameters)
+
+    async def post(self, statements: List[Statement]) -> dict:
+        """
+        Coroutine version of :meth:`neo4j.Connector.post`.
+        """
+        return self._decode(await self._send(*self._encode(statements)))
+
+    async def _gather_batches(self, post_batch, statements: Iterable[Statement], batch_size: int, byte_budget: int,
+                              max_in_flight: int) -> list:
+        # max_in_flight workers pull the batches from a shared iterator, so that (like Connector._post_concurrently)
+        # only the batches in flight are read from the (possibly lazy) statements and encoded at the same time
+        if max_in_flight is None:
+            max_in_flight = self.pool_maxsize
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight should be >= 1")
+
+        batches = enumerate(self.make_batches(statements, batch_size, byte_budget))
+        responses = {}
+
+        async def worker():
+            for index, statements_batch in batches:
+                responses[index] = await post_batch(statements_batch)
+
+        workers = [asyncio.ensure_future(worker()) for _ in range(min(max_in_flight, self.pool_maxsize))]
+        try:
+            await asyncio.gather(*workers)
+        except BaseException:
+            # stop sending the remaining batches after an error
+            for running_worker in workers:
+                running_worker.cancel()
+            raise
+
+        return [responses[index] for index in range(len(responses))]
+
+    async def _execute_batch(self, statements: List[Statement]):
+        content = await self._send(*self._encode(statements))
+        if not _has_no_errors(content):
+            self._decode(content)
+
+    async def _send(self, data: bytes, headers: dict = None) -> bytes:
+        async with self._get_session().post(self.endpoint, data=data, headers=headers) as response:
+            return await response.read()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        # the session can only be created within the running event loop
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_maxsize, keepalive_timeout=self.keepalive_timeout),
+                headers=self._headers,
+            )
+        return self._session
+
+
+class _AsyncRows:
+    # asynchronous iterator over the rows of a single statement, which runs the statement on the first iteration. It
+    # is a class instead of an asynchronous generator, because those are a syntax error on Python 3.5
+
+    def __init__(self, connector: AsyncConnector, cypher: str, parameters: dict = None):
+        self._connector = connector
+        self._cypher = cypher
+        self._parameters = parameters
+        self._rows = None
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> dict:
+        if self._rows is None:
+            self._rows = iter(await self._connector.run(self._cypher, self._parameters))
+        try:
+            return next(self._rows)
+        except StopIteration:
+            raise StopAsyncIteration
@@ -18,6 +18,11 @@ setup(
     license='MIT',
     packages=['neo4j'],
     install_requires=install_requires,
+    extras_require={
+        'orjson': ['orjson'],
+        'ijson': ['ijson>=3.1'],
+        'aio': ['aiohttp>=3.0'],
+    },
     test_suite='tests',
     classifiers=[
         "Intended Audience :: Developers",
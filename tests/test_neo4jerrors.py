@@ -2,31 +2,32 @@ from unittest import TestCase
 from neo4j import Neo4jErrors, Neo4jError
 
 
-class Neo4jErrorTestCase(TestCase):
-    def test_single_error(self):
+class SingleNeo4jErrorTestCase(TestCase):
+    def test_neo4j_error(self):
         code = 'code'
         message = 'message'
 
-        error_dicts = [{'code': code, 'message': message}]
-        expected_error_obj = Neo4jError(code, message)
+        error = Neo4jError(code, message)
 
-        neo4j_errors = Neo4jErrors(error_dicts)
+        self.assertEqual(error.code, code)
+        self.assertEqual(error.message, message)
 
-        self.assertEqual(len([error for error in neo4j_errors]), len(error_dicts))
-        self.assertIn(expected_error_obj, neo4j_errors)
 
-    def test_multiple_errors(self):
-        code = 'code'
-        message = 'message'
-        code2 = 'code2'
-        message2 = 'message2'
+class Neo4jErrorsCollectionTestCase(TestCase):
+    # single source of the (code, message) pairs, the cases are a single and multiple errors
+    specs = [('code', 'message'), ('code2', 'message2')]
+    cases = [specs[:1], specs]
+
+    def test_errors(self):
+        for pairs in self.cases:
+            with self.subTest(pairs=pairs):
+                error_dicts = [{'code': code, 'message': message} for code, message in pairs]
 
-        error_dicts = [{'code': code, 'message': message}, {'code': code2, 'message': message2}]
-        expected_error_obj1 = Neo4jError(code, message)
-        expected_error_obj2 = Neo4jError(code2, message2)
+                neo4j_errors = Neo4jErrors(error_dicts)
 
-        neo4j_errors = Neo4jErrors(error_dicts)
+                self.assertEqual(len(neo4j_errors), len(error_dicts))
+                self.assertTrue(all(isinstance(error, Neo4jError) for error in neo4j_errors))
 
-        self.assertEqual(len([error for error in neo4j_errors]), len(error_dicts))
-        self.assertIn(expected_error_obj1, neo4j_errors)
-        self.assertIn(expected_error_obj2, neo4j_errors)
+                seen = {(error.code, error.message) for error in neo4j_errors}
+                for pair in pairs:
+                    self.assertIn(pair, seen)
@@ -1,4 +1,7 @@
 from unittest import TestCase
+import copy
+import json
+import pickle
 from neo4j import Statement
 
 
@@ -23,3 +26,41 @@ class StatementTestCase(TestCase):
 
         self.assertIn('parameters', statement)
         self.assertEqual(statement['parameters'], self.params)
+
+    def test_to_json_bytes(self):
+        statement = Statement(self.cypher, self.params)
+        encoded = statement.to_json_bytes()
+
+        self.assertEqual(json.loads(encoded), {'statement': self.cypher, 'parameters': self.params})
+
+    def test_to_json_bytes_after_modification(self):
+        params = dict(self.params)
+        statement = Statement(self.cypher, params)
+        statement.to_json_bytes()
+
+        params['key'] = 'other'
+        statement['statement'] = 'other'
+        self.assertEqual(json.loads(statement.to_json_bytes()), {'statement': 'other', 'parameters': params})
+
+    def test_copy_and_pickle(self):
+        statement = Statement(self.cypher).with_params(dict(self.params))
+
+        for copied in [copy.deepcopy(statement), pickle.loads(pickle.dumps(statement))]:
+            self.assertIsInstance(copied, Statement)
+            self.assertEqual(copied, statement)
+            self.assertIsNone(copied._encoded_cypher)
+
+            copied['parameters']['key'] = 'other'
+            self.assertEqual(json.loads(copied.to_json_bytes())['parameters'], {'key': 'other'})
+
+    def test_with_params(self):
+        template = Statement(self.cypher)
+        statement = template.with_params(self.params)
+
+        self.assertEqual(statement, Statement(self.cypher, self.params))
+        self.assertEqual(json.loads(statement.to_json_bytes()), {'statement': self.cypher, 'parameters': self.params})
+        self.assertEqual(json.loads(template.with_params().to_json_bytes()), {'statement': self.cypher})
+
+        # the shared encoding isn't used anymore once the statement is replaced
+        statement['statement'] = 'other'
+        self.assertEqual(json.loads(statement.to_json_bytes()), {'statement': 'other', 'parameters': self.params})